@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+지문 전처리 파이프라인.
+웹에서 붙여 넣은 지문을 정리해서 두 단계 프롬프트(분석·완성 글)에 넣을 형태로 만든다.
+streamlit에 의존하지 않으므로 tests/ 에서 바로 import 해서 검사할 수 있다.
+"""
+import hashlib
+import re
+import unicodedata
+
+# 웹에서 붙여 넣은 지문에 섞여 들어오는 특수 공백·보이지 않는 문자
+_INVISIBLE_CHARS = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff\u00ad"), None)
+_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200a\u202f\u205f\u3000]+")
+
+# 메뉴·공유 버튼 등 내비게이션 조각 (줄 전체가 일치해야 함)
+_NAV_LINE_RE = re.compile(
+    r"^(홈|메뉴|로그인|회원가입|검색|구독|구독하기|공유|공유하기|좋아요|댓글|댓글\s*\d*|"
+    r"관련\s*기사|많이 본 기사|이전\s*글|다음\s*글|목록|맨\s*위로|TOP|광고|AD|"
+    r"Home|Menu|Login|Sign in|Subscribe|Share|Advertisement|Related articles?)$",
+    re.IGNORECASE,
+)
+# 저작권 표기, 기자 바이라인, 이메일, 입력·수정 시각 (줄 전체가 일치해야 함)
+_BOILERPLATE_RE = re.compile(
+    r"^((ⓒ|©).*"
+    r"|Copyright\s*(©|\(c\))?\s*\d{4}.*"
+    r"|.*All rights reserved\.?"
+    r"|.*무단\s*전재\s*(및|와|,)?\s*재배포\s*금지\.?"
+    r"|(\([^)]*\)\s*)?\S{2,4}\s*기자\s*(=|\S+@\S+\.\w+)"
+    r"|\S+@\S+\.\w+"
+    r"|(입력|수정|승인|등록)\s*:?\s*\d{4}[.\-/]\d{1,2}[.\-/]\d{1,2}.*)$",
+    re.IGNORECASE,
+)
+# 통신사 기사 첫 줄의 "(서울=연합뉴스) 홍길동 기자 = " 부분 (뒤의 본문 문장은 남긴다)
+_BYLINE_PREFIX_RE = re.compile(r"^(\([^)]*=[^)]*\)\s*)?\S{2,4}\s*기자\s*=\s*")
+_NAV_MAX_LEN = 20
+_BOILERPLATE_MAX_LEN = 80
+
+# 이보다 짧은 줄은 반복되어도 지우지 않는다. (대화 "네.", 시의 후렴 등)
+DEDUP_MIN_CHARS = 30
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정치 (tiktoken 없이 계산).
+    한글·한자·가나는 글자당 약 1토큰, 그 밖의 글자(공백 포함)는 4글자당 약 1토큰으로 센다.
+    """
+    cjk = sum(1 for ch in text if "\u1100" <= ch <= "\u11ff" or "\u3040" <= ch <= "\u30ff"
+              or "\u3130" <= ch <= "\u318f" or "\u4e00" <= ch <= "\u9fff" or "\uac00" <= ch <= "\ud7a3")
+    others = len(text) - cjk
+    return cjk + (others + 3) // 4
+
+
+def is_nav_line(line: str) -> bool:
+    """메뉴·공유 버튼 등 내비게이션 조각인지 판별."""
+    return len(line) <= _NAV_MAX_LEN and bool(_NAV_LINE_RE.match(line))
+
+
+def is_boilerplate(line: str) -> bool:
+    """내비게이션 조각·저작권 표기·바이라인 등 본문이 아닌 줄인지 판별."""
+    if is_nav_line(line):
+        return True
+    return len(line) <= _BOILERPLATE_MAX_LEN and bool(_BOILERPLATE_RE.match(line))
+
+
+def _strip_edges(entries: list, is_junk) -> tuple[int, int]:
+    """entries 앞뒤에서 is_junk 인 줄을 걷어낸 뒤 남는 구간 [start, end)를 돌려준다."""
+    start, end = 0, len(entries)
+    while start < end and is_junk(entries[start][1]):
+        start += 1
+    while end > start and is_junk(entries[end - 1][1]):
+        end -= 1
+    return start, end
+
+
+def preprocess_passage(raw_text: str) -> tuple[str, dict]:
+    """
+    지문 전처리.
+    1) 유니코드(NFC)·줄바꿈·공백 정규화, 보이지 않는 문자 제거
+    2) 지문 맨 앞·맨 뒤의 메뉴 조각, 저작권 표기, 기자 바이라인 제거 (본문 중간은 건드리지 않음)
+       - 전부 지워질 상황이면 메뉴 조각만 걷어낸다.
+       - 첫 줄이 "(서울=연합뉴스) 홍길동 기자 = 본문..." 이면 바이라인 부분만 뗀다.
+    3) 앞 문단과 똑같은 문단을 제거한 뒤, 줄 단위로 한 번 더 반복을 제거
+       (둘 다 DEDUP_MIN_CHARS 글자 이상일 때만)
+    4) 문단 분리 후 [1], [2] ... 번호 매기기
+    반환값: (전처리된 지문, 통계 dict)
+    - 통계: 원문/결과 글자 수·추정 토큰 수, 줄어든 글자·토큰 수(실제 전달되는 문단 번호 포함,
+      음수면 오히려 늘어난 것), 문단 수, 제거된 상용구·중복 줄 목록, 캐시 키용 passage_key
+    """
+    text = unicodedata.normalize("NFC", raw_text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n").translate(_INVISIBLE_CHARS)
+
+    # 빈 줄이 있으면 빈 줄 기준으로 문단을 나누고, 없으면 한 줄을 한 문단으로 본다.
+    blocks = re.split(r"\n\s*\n", text) if re.search(r"\n\s*\n", text) else text.split("\n")
+
+    # (문단 번호, 줄) 목록
+    entries = []
+    for block_no, block in enumerate(blocks):
+        for line in block.split("\n"):
+            line = _SPACE_RE.sub(" ", line).strip()
+            if line:
+                entries.append((block_no, line))
+
+    # 상용구는 지문 앞뒤 가장자리에서만 걷어낸다.
+    start, end = _strip_edges(entries, is_boilerplate)
+    if start == end:
+        start, end = _strip_edges(entries, is_nav_line)
+    removed_boilerplate = [line for _, line in entries[:start] + entries[end:]]
+    entries = entries[start:end]
+
+    if entries:
+        block_no, first_line = entries[0]
+        prefix = _BYLINE_PREFIX_RE.match(first_line)
+        if prefix and first_line[prefix.end():]:
+            removed_boilerplate.insert(0, prefix.group().strip())
+            entries[0] = (block_no, first_line[prefix.end():])
+
+    blocks_kept = {}
+    for block_no, line in entries:
+        blocks_kept.setdefault(block_no, []).append(line)
+
+    # 1) 문단 전체가 앞 문단과 같으면 통째로 제거 (짧은 문단은 줄과 같은 이유로 남김)
+    removed_duplicates = []
+    seen_blocks = set()
+    unique_blocks = []
+    for lines in blocks_kept.values():
+        block_text = " ".join(lines)
+        if len(block_text) >= DEDUP_MIN_CHARS:
+            if block_text in seen_blocks:
+                removed_duplicates.append(block_text)
+                continue
+            seen_blocks.add(block_text)
+        unique_blocks.append(lines)
+
+    # 2) 긴 줄이 반복되면 두 번째부터 제거
+    paragraphs = []
+    seen = set()
+    for lines in unique_blocks:
+        kept_lines = []
+        for line in lines:
+            if len(line) >= DEDUP_MIN_CHARS:
+                if line in seen:
+                    removed_duplicates.append(line)
+                    continue
+                seen.add(line)
+            kept_lines.append(line)
+        if kept_lines:
+            paragraphs.append(kept_lines)
+
+    cleaned = "\n\n".join(
+        f"[{i}] {' '.join(lines)}" for i, lines in enumerate(paragraphs, start=1)
+    )
+
+    raw_tokens = estimate_tokens(raw_text)
+    clean_tokens = estimate_tokens(cleaned)
+    stats = {
+        "raw_chars": len(raw_text),
+        "clean_chars": len(cleaned),
+        "chars_removed": len(raw_text) - len(cleaned),
+        "raw_tokens": raw_tokens,
+        "clean_tokens": clean_tokens,
+        "tokens_removed": raw_tokens - clean_tokens,
+        "paragraphs": len(paragraphs),
+        "removed_boilerplate": removed_boilerplate,
+        "removed_duplicates": removed_duplicates,
+        "passage_key": hashlib.sha256(cleaned.encode("utf-8")).hexdigest()[:16],
+    }
+    return cleaned, stats
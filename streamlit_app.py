@@ -1,10 +1,24 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
+import time
 import datetime
 from pathlib import Path
 
+# ---- 스크립트 실행 시간 측정용 (HAMCHANG_PROFILE_STARTUP=1 일 때만 결과 출력) ----
+# streamlit은 이 스크립트보다 먼저 로드되므로 여기서는 스크립트 실행 구간(앱 모듈 import 포함)만 잰다.
+# 모듈별 import 시간은 tests/test_startup.py 가 `python -X importtime` 으로 실행해 기록한다.
+_STARTUP_T0 = time.perf_counter()
+_STARTUP_MARKS: list[tuple[str, float]] = []
+
 import streamlit as st
-from openai import OpenAI
+
+from passage_preprocess import preprocess_passage
+from prompts import ANALYSIS_INSTRUCTIONS_TEMPLATE, FINAL_REPORT_INSTRUCTIONS_TEMPLATE
+
+_STARTUP_MARKS.append(("import app modules", time.perf_counter()))
+
+# openai(및 pydantic/httpx)는 무거우므로 실제 API를 호출할 때만 불러온다. (call_openai_text 참고)
 
 # ---------------- 기본 설정 ----------------
 st.set_page_config(
@@ -14,6 +28,7 @@ st.set_page_config(
 
 st.title("함창고 박호종 선생님과 함께하는 글의 타당성 검사")
 st.caption("고2 비판적 독해 수업용 · 생성형 AI를 활용한 주장–근거 타당성 점검 도구")
+_STARTUP_MARKS.append(("page setup", time.perf_counter()))
 
 TODAY_STR = datetime.date.today().isoformat()
 
@@ -33,6 +48,12 @@ USED_IDS_FILE = Path("used_ids.txt")
 # 반별 최대 번호 (2학년 1~4반)
 CLASS_MAX = {1: 23, 2: 24, 3: 22, 4: 22}  # 2-1,2-2,2-3,2-4
 
+# 시작 성능 측정 모드 (CI에서 콜드 스타트 회귀를 막기 위해 사용)
+# - HAMCHANG_PROFILE_STARTUP=1 : 스크립트 단계별 소요 시간과 첫 화면 렌더링까지의 시간을 stderr에 출력
+# - HAMCHANG_STARTUP_BUDGET_MS : 첫 화면 렌더링 시간 한도(ms). 넘거나 openai가 미리 로드되면 오류 발생
+PROFILE_STARTUP = os.getenv("HAMCHANG_PROFILE_STARTUP", "") == "1"
+STARTUP_BUDGET_MS = float(os.getenv("HAMCHANG_STARTUP_BUDGET_MS", "0") or 0)
+
 
 # ---------------- 학번 관련 유틸 ----------------
 def build_student_code(class_no: int, number: int) -> str:
@@ -105,6 +126,8 @@ def call_openai_text(
     OpenAI Chat Completions API를 사용해 텍스트를 반환.
     - temperature를 낮게(0.2 전후) 설정해 논리 일관성·채점 엄격성을 강화.
     """
+    from openai import OpenAI  # 지연 import: 버튼을 눌렀을 때만 로드
+
     client = OpenAI(api_key=api_key)
 
     try:
@@ -140,107 +163,54 @@ def increase_api_count():
     st.session_state["usage_count"] = st.session_state.get("usage_count", 0) + 1
 
 
-# ---------------- 타당성 평가용 시스템 프롬프트 (논리 강도 강화 버전) ----------------
-ANALYSIS_INSTRUCTIONS = f"""
-당신은 고등학교 2학년 학생을 돕는 '비판적 독해·타당성 평가 전문 조교'입니다.
-목표는 **주장–근거–검증–점수**를 구조적으로, 빠짐없이, 일관되게 분석하는 것입니다.
-
-# 역할
-- 학생이 올린 지문에 대해,
-  1) 타당성 검사가 꼭 필요한 주장/부분을 찾고,
-  2) 각 부분에 대해 검사·검증 결과를 논리적으로 서술하며,
-  3) 5점 척도로 일관되게 평가합니다.
-- 답변은 "친절하지만 단단한 논리 선생님" 느낌으로, 감상보다 분석에 집중합니다.
-
-# 맥락 · 제약
-- 대상: 고등학교 2학년 비판적 독해 수업.
-- 저작권 준수: 직접 인용은 40~80자 내, 필요한 최소 분량만.
-- 실제 웹 검색은 하지 말고, 기억에 기반해 대표적인 기관·교재·논문·도서를 예로 듭니다.
-- URL이 필요할 때는 실제로 있을 법한 형식을 쓰되, 확실하지 않으면
-  - 기관명, 자료명, 연도, 추천 검색어만 제시하고
-  - 임의로 지어낸 주소는 만들지 마십시오.
-
-# 타당도 5점 척도 (반드시 이 기준으로만 평가)
-- 5점: 타당도가 아주 높음
-  - 근거가 충분하고 정확하며, 신뢰도 높은 출처에 기반함.
-  - 반례 가능성이 낮거나, 반례를 충분히 설명/해소함.
-- 4점: 타당도가 높으나, 출처·조건 설명이 일부 부족함.
-- 3점: 타당성이 있으나, 출처가 없거나 약함. 일반 독자가 의문을 제기할 여지가 큼.
-- 2점: 특수 사례·개인 경험 등, 일반화가 어려운 근거에 지나치게 의존함.
-- 1점: 근거가 없거나, 주장과 직접 연결되지 않음. 논리적 비약·오해 소지가 큼.
-
-# Plan First (먼저 5줄만 간단히 계획부터 제시)
-1) 지문 주제와 핵심 주장 후보 2~3개
-2) 특히 타당성 검사가 필요한 부분 유형(개념 정의, 전제, 예시, 인과관계 등)
-3) 근거 유형 분포 예상(데이터/전문가 견해/논리·사례/권위 인용 등)
-4) 외부 검증이 필요한 쟁점 2~3개
-5) 사용할 도식화 방식(텍스트 트리 + 표)와 이유
-
-# 단계별 지침 (이 순서를 반드시 지키십시오)
-1) 지문을 3문장 이내로 요약하고, 핵심 주장 3개 이내로 번호 매겨 제시.
-2) 각 주장에 대해 **타당성 검사가 필요한 부분**을 찾고,
-   - 40~80자 인용,
-   - 대략적인 위치(앞/중간/뒤, 혹은 문단 번호),
-   - 왜 점검이 필요한지 간단히 설명.
-3) 주장별로 **검사·검증 결과**를 서술:
-   - 사실성(현재 학계·교과서와 맞는지),
-   - 개념 사용의 적절성,
-   - 전제/조건이 명시되었는지 여부,
-   - 누락된 설명 또는 논리적 비약이 있는지.
-4) 각 주장에 대해 **타당성 평가(5점 척도)** 점수와 채점 이유(1~2문장)를 표 형태로 정리.
-5) 대표적인 검증용 자료(웹사이트/도서/논문) 예시를 1~3개씩 제안.
-   - 모를 경우, 기관명+자료명+연도+검색어만 제시.
-
-# 출력 형식(마크다운, 이 구조를 최대한 지키되, 각 섹션을 비워두지 말 것)
-## 1) 한눈에 보는 요약
-- 지문 주제/핵심 주장(최대 3개)
-- 전체적으로 타당성이 취약한 핵심 포인트 2~3개
-
-## 2) 타당성 검사가 필요한 부분
-- 주장 A: (한 줄 요약)
-  - 인용: "..." (대략적인 위치)
-  - 왜 이 부분이 특히 점검이 필요한지
-- 주장 B: ...
-(주장이 1개뿐이어도 이 형식을 유지)
-
-## 3) 검사·검증 결과 정리
-- 주장 A
-  - 사실성:
-  - 개념 사용:
-  - 전제·조건:
-  - 비약/누락:
-- 주장 B
-  - ...
-
-## 4) 타당성 평가(5점 척도)
-
-| 주장 | 핵심 내용 요약 | 타당도(1~5점) | 채점 이유(1~2문장) |
-|---|---|---|---|
-
-## 5) 검증용 링크·출처 제안
-- (웹사이트) 예시 2~3개
-- (도서) 예시 1~2개
-- (논문/학술자료) 예시 1~2개
-※ 실제 주소를 모를 경우, 기관명·자료명·연도·추천 검색어만 제시.
-
-## 6) 학생 선택용 주장 목록
-- [선택1] 주장 A: (한 줄 요약)
-- [선택2] 주장 B: (한 줄 요약)
-- [선택3] 주장 C: (한 줄 요약)
-(핵심 주장 수에 맞게 개수 조정 가능)
-
-## 7) Self-Check
-- 타당성 검사가 필요한 부분이 빠짐없이 정리되었는가?
-- 검사·검증 결과가 근거를 가지고 서술되었는가?
-- 5점 척도 기준이 일관되게 적용되었는가?
-
-# 톤
-- 감상보다는 분석에 초점을 둔, 단단하고 또렷한 설명.
-- 고2 학생이 읽을 수 있도록, 어려운 용어는 짧게 풀이를 덧붙입니다.
-
-# 현재일
-- {TODAY_STR}
-"""
+# ---------------- 시작 성능 측정 ----------------
+@st.cache_resource(show_spinner=False)
+def _process_state() -> dict:
+    """프로세스 단위로 유지되는 상태 (첫 실행 = 콜드 스타트 여부 판별용)."""
+    return {"cold_start_done": False}
+
+
+def report_startup_profile():
+    """
+    스크립트 단계별 소요 시간과 첫 화면 렌더링까지 걸린 시간을 stderr에 출력한다.
+    - streamlit 자체의 import 시간은 포함되지 않는다. (모듈별 분석은 python -X importtime)
+    - 점검(한도 초과, openai 사전 로드)은 프로세스의 첫 실행(콜드 스타트)에서만 한다.
+    - 문제가 있으면 RuntimeError 발생 → CI에서 실패로 잡힌다.
+    """
+    end = time.perf_counter()
+    total_ms = (end - _STARTUP_T0) * 1000
+
+    state = _process_state()
+    cold = not state["cold_start_done"]
+    state["cold_start_done"] = True
+
+    lines = [f"[startup-profile] {'cold start' if cold else 'rerun'}"]
+    prev = _STARTUP_T0
+    for label, t in _STARTUP_MARKS + [("render page", end)]:
+        lines.append(f"  {label:<22} {(t - prev) * 1000:8.1f} ms")
+        prev = t
+    lines.append(f"  {'time to first render':<22} {total_ms:8.1f} ms (script only)")
+
+    openai_loaded = "openai" in sys.modules
+    lines.append(f"  openai loaded: {'yes' if openai_loaded else 'no'}")
+    print("\n".join(lines), file=sys.stderr)
+
+    if not cold:
+        return
+
+    problems = []
+    if openai_loaded:
+        problems.append("API 호출 전에 openai가 로드되었습니다.")
+    if STARTUP_BUDGET_MS and total_ms > STARTUP_BUDGET_MS:
+        problems.append(f"첫 화면 렌더링 {total_ms:.0f}ms가 한도 {STARTUP_BUDGET_MS:.0f}ms를 넘었습니다.")
+    if problems:
+        raise RuntimeError("시작 성능 점검 실패: " + " ".join(problems))
+
+
+# ---------------- 시스템 프롬프트 (템플릿은 prompts.py, 날짜만 채움) ----------------
+ANALYSIS_INSTRUCTIONS = ANALYSIS_INSTRUCTIONS_TEMPLATE.format(today=TODAY_STR)
+FINAL_REPORT_INSTRUCTIONS = FINAL_REPORT_INSTRUCTIONS_TEMPLATE.format(today=TODAY_STR)
+_STARTUP_MARKS.append(("definitions + prompts", time.perf_counter()))
 
 
 # ---------------- 세션 상태 초기화 ----------------
@@ -348,6 +318,26 @@ passage_text = st.text_area(
     placeholder="분석하고 싶은 글(지문)을 여기에 붙여 넣으세요."
 )
 
+# 두 단계 프롬프트에는 원문 대신 전처리된 지문(문단 번호 포함)을 넣는다.
+clean_passage, passage_stats = preprocess_passage(passage_text)
+if passage_text.strip():
+    removed_lines = passage_stats["removed_boilerplate"] + passage_stats["removed_duplicates"]
+    st.caption(
+        f"지문 전처리: 문단 {passage_stats['paragraphs']}개 · "
+        f"상용구 줄 {len(passage_stats['removed_boilerplate'])}개, "
+        f"중복 줄 {len(passage_stats['removed_duplicates'])}개 제거 · "
+        f"AI 전달량(문단 번호 포함) 글자 {passage_stats['raw_chars']}→{passage_stats['clean_chars']}자, "
+        f"토큰 약 {passage_stats['raw_tokens']}→{passage_stats['clean_tokens']}개"
+    )
+    with st.expander("전처리된 지문 보기 (AI에 전달되는 내용)"):
+        st.text(clean_passage)
+        if removed_lines:
+            st.markdown("**제거된 줄**")
+            for line in passage_stats["removed_boilerplate"]:
+                st.text(f"(상용구) {line}")
+            for line in passage_stats["removed_duplicates"]:
+                st.text(f"(중복) {line}")
+
 st.markdown("**③ 일반적인 타당성 검사 포인트 (복수 선택 가능)**")
 
 validity_options = [
@@ -390,8 +380,8 @@ st.markdown("---")
 st.subheader("3. 1단계: 생성형 AI를 활용한 타당성 분석")
 
 if st.button("🧪 1단계: 타당성 분석 실행", type="primary"):
-    if not passage_text.strip():
-        st.error("지문(분석할 글)을 먼저 입력해 주세요.")
+    if not clean_passage:
+        st.error("지문(분석할 글)을 먼저 입력해 주세요. (전처리 후 남은 본문이 없습니다.)")
     else:
         if not can_call_api():
             st.stop()
@@ -418,8 +408,8 @@ if st.button("🧪 1단계: 타당성 분석 실행", type="primary"):
 [학생이 특히 점검하고 싶은 타당성 포인트]
 {points_text}
 
-[분석 대상 지문]
-{passage_text}
+[분석 대상 지문] (문단 번호는 전처리 단계에서 붙인 것)
+{clean_passage}
 """
 
                 try:
@@ -512,58 +502,6 @@ final_requirements = st.text_area(
 )
 st.session_state["final_requirements"] = final_requirements
 
-FINAL_REPORT_INSTRUCTIONS = f"""
-당신은 '비판적 독해 활동 보고서'를 작성하는 조교입니다.
-아래 정보를 바탕으로, 고등학교 2학년 학생의 활동 결과를 정리한 글을 써 주세요.
-
-# 매우 중요한 제한
-- 전체 분량은 **한국어 기준 공백 포함 약 1,800~2,200자(2000자 내외)**로 하십시오.
-- 2,200자를 넘기지 마십시오.
-- 아래 정보 중,
-  - [학생이 최종 글에 반영하고자 선택한 주장/논점],
-  - 체크박스로 선택된 영역:
-    - 타당성 검사가 필요한 부분 포함 여부
-    - 검사·검증 결과 포함 여부
-    - 타당성 평가(점수) 포함 여부
-  - [완성 글에 대한 추가 요구사항]
-  를 중심으로 글을 구성합니다.
-
-# 구성 제안
-1) 활동 배경·선정 동기 (1~2문단)
-2) 지문 핵심 내용과 학생이 선택한 주요 주장 정리 (1문단)
-3) **학생이 선택한 주장/논점에 대한 타당성 분석 과정 요약**
-   - (체크된 항목에 따라)
-     - 타당성 검사가 필요한 부분 설명
-     - 검사·검증 결과 요약
-     - 타당성 평가(점수)에 대한 학생의 이해와 느낀 점
-4) 외부 검증(출처·자료 조사) 계획 또는 예시 1~2개
-5) 활동을 통해 배운 점·앞으로의 다짐 (1~2문단)
-
-# 체크박스에 따른 포함 규칙
-- include_needs_check == True 인 경우:
-  - '타당성 검사가 필요한 부분'을 본문에서 구체적인 예시와 함께 다루십시오.
-- include_verification == True 인 경우:
-  - '검사·검증 결과(사실성·개념 사용·전제 등)'를 본문에서 정리해 주세요.
-- include_scores == True 인 경우:
-  - '타당성 평가(5점 척도)'를 언급하되, 숫자 자체보다 학생이 점수를 어떻게 해석했는지 중심으로 서술하십시오.
-- False인 항목은 본문에서 생략하거나 간단한 한두 문장 언급에 그치십시오.
-
-# 추가 요구사항 반영
-- [완성 글에 대한 추가 요구사항] 섹션이 주어지면, 가능한 범위에서 글의 구성과 표현에 최대한 반영하십시오.
-- 다만, 전체 흐름(배경 → 분석 → 느낀점)을 해치지 않는 선에서 조정합니다.
-
-# 톤
-- 또렷하고 진지하지만, 고2 학생의 자연스러운 글 느낌 유지
-- 과장된 표현보다 실제 수업 활동에 가까운 느낌으로 작성
-
-# 길이
-- A4 기준 1~2쪽 분량, 글자 수는 1,800~2,200자 사이 목표
-- 2,200자를 넘지 않도록 할 것
-
-# 현재일
-- {TODAY_STR}
-"""
-
 if st.button("📝 3단계: 완성된 글 생성", type="secondary"):
     if not st.session_state["analysis_result"]:
         st.error("먼저 3번 단계(1단계 타당성 분석)를 실행해 주세요.")
@@ -595,8 +533,8 @@ if st.button("📝 3단계: 완성된 글 생성", type="secondary"):
 [학생 선정 동기]
 {selected_motivation}
 
-[분석 대상 지문]
-{passage_text}
+[분석 대상 지문] (문단 번호는 전처리 단계에서 붙인 것)
+{clean_passage}
 
 [AI 타당성 분석 결과 전체]
 {st.session_state['analysis_result']}
@@ -673,3 +611,6 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+if PROFILE_STARTUP:
+    report_startup_profile()
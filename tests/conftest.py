@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+# 저장소 최상위(streamlit_app.py 가 있는 폴더)의 모듈을 테스트에서 import 할 수 있게 한다.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
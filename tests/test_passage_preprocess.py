@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+from passage_preprocess import estimate_tokens, preprocess_passage
+
+
+def test_body_sentences_with_copyright_or_reporter_words_are_kept():
+    raw = (
+        "저작권(copyright)은 창작자의 권리를 보호하는 제도이다.\n"
+        "저는 기자\n"
+        "무단 전재와 재배포 금지 문구는 흔히 기사 끝에 붙는다."
+    )
+    cleaned, stats = preprocess_passage(raw)
+    assert "저작권(copyright)은" in cleaned
+    assert "저는 기자" in cleaned
+    assert "무단 전재와 재배포 금지 문구는" in cleaned
+    assert stats["paragraphs"] == 3
+    assert stats["removed_boilerplate"] == []
+
+
+def test_single_sentence_about_copyright_notice_is_not_emptied():
+    cleaned, _ = preprocess_passage("무단 전재와 재배포 금지 문구는 흔히 기사 끝에 붙는다.")
+    assert cleaned == "[1] 무단 전재와 재배포 금지 문구는 흔히 기사 끝에 붙는다."
+
+
+def test_boilerplate_stripped_only_at_edges():
+    raw = (
+        "홈\n메뉴\n\n"
+        "경제학에서 합리적 선택은 중요하다.\n\n"
+        "홍길동 기자 hong@news.com\n\n"
+        "한계비용과 한계수입이 같을 때 이윤이 최대가 된다.\n\n"
+        "공유하기\n"
+        "ⓒ 뉴스일보 무단 전재 및 재배포 금지"
+    )
+    cleaned, stats = preprocess_passage(raw)
+    assert cleaned.startswith("[1] 경제학에서")
+    # 본문 중간의 바이라인은 남긴다.
+    assert "[2] 홍길동 기자 hong@news.com" in cleaned
+    assert stats["removed_boilerplate"] == ["홈", "메뉴", "공유하기", "ⓒ 뉴스일보 무단 전재 및 재배포 금지"]
+
+
+def test_byline_requires_email_or_equals():
+    cleaned, stats = preprocess_passage("(서울=연합뉴스) 홍길동 기자 = \n본문 문장이다.")
+    assert cleaned == "[1] 본문 문장이다."
+    assert len(stats["removed_boilerplate"]) == 1
+
+
+def test_repeated_short_lines_are_kept():
+    raw = "네.\n정말요?\n네.\n엄마야 누나야 강변 살자\n뜰에는 반짝이는 금모래 빛\n엄마야 누나야 강변 살자"
+    cleaned, stats = preprocess_passage(raw)
+    assert cleaned.count("[") == 6
+    assert cleaned.endswith("[6] 엄마야 누나야 강변 살자")
+    assert stats["removed_duplicates"] == []
+
+
+def test_repeated_long_lines_are_removed_and_reported():
+    long_line = "이 문장은 웹 페이지에서 두 번 복사되어 들어온 충분히 긴 본문 문장입니다."
+    cleaned, stats = preprocess_passage(f"{long_line}\n\n다른 문단.\n\n{long_line}")
+    assert cleaned == f"[1] {long_line}\n\n[2] 다른 문단."
+    assert stats["removed_duplicates"] == [long_line]
+
+
+def test_empty_and_whitespace_only_input():
+    for raw in ["", "   \n\t\n\u3000\u200b  "]:
+        cleaned, stats = preprocess_passage(raw)
+        assert cleaned == ""
+        assert stats["paragraphs"] == 0
+        assert stats["clean_chars"] == 0
+        assert stats["chars_removed"] == len(raw)
+        assert stats["tokens_removed"] == stats["raw_tokens"]
+
+
+def test_removed_counts_match_what_is_sent():
+    raw = "가나다   라마\n\n\n\n바사아"
+    cleaned, stats = preprocess_passage(raw)
+    assert cleaned == "[1] 가나다 라마\n\n[2] 바사아"
+    assert stats["chars_removed"] == len(raw) - len(cleaned)
+    assert stats["tokens_removed"] == estimate_tokens(raw) - estimate_tokens(cleaned)
+    assert stats["tokens_removed"] == stats["raw_tokens"] - stats["clean_tokens"]
+
+
+def test_numbering_can_make_output_larger():
+    cleaned, stats = preprocess_passage("a\nb\nc")
+    assert stats["clean_chars"] > stats["raw_chars"]
+    assert stats["chars_removed"] < 0
+    assert stats["tokens_removed"] == stats["raw_tokens"] - stats["clean_tokens"]
+
+
+def test_whitespace_normalization_saves_tokens():
+    _, stats = preprocess_passage("word" + " " * 40 + "word")
+    assert stats["tokens_removed"] > 0
+
+
+def test_passage_key_is_stable_for_equivalent_input():
+    _, a = preprocess_passage("첫 문단\n\n둘째 문단")
+    _, b = preprocess_passage("첫   문단\r\n\r\n둘째 문단\u200b\n")
+    assert a["passage_key"] == b["passage_key"]
+
+
+def test_wire_byline_prefix_is_stripped_but_lead_sentence_kept():
+    lead = "정부는 19일 새로운 교육 정책을 발표했다고 밝혔다."
+    cleaned, stats = preprocess_passage(f"(서울=연합뉴스) 홍길동 기자 = {lead}\n\n본문")
+    assert cleaned == f"[1] {lead}\n\n[2] 본문"
+    assert stats["removed_boilerplate"] == ["(서울=연합뉴스) 홍길동 기자 ="]
+
+    cleaned, _ = preprocess_passage(f"(서울=연합뉴스) 홍길동 기자 = {lead}")
+    assert cleaned == f"[1] {lead}"
+
+
+def test_copyright_needs_notice_shape():
+    raw = "Copyright and Fair Use\n\nCopyright law gives creators exclusive rights for a limited time."
+    cleaned, stats = preprocess_passage(raw)
+    assert cleaned.startswith("[1] Copyright and Fair Use")
+    assert stats["removed_boilerplate"] == []
+
+    cleaned, stats = preprocess_passage("Body text.\n\nCopyright (c) 2024 News Corp.\nAll rights reserved.")
+    assert cleaned == "[1] Body text."
+    assert len(stats["removed_boilerplate"]) == 2
+
+
+def test_passage_is_never_stripped_to_nothing():
+    cleaned, stats = preprocess_passage("홈\n\nⓒ 뉴스일보 무단 전재 및 재배포 금지\n\n공유하기")
+    assert cleaned == "[1] ⓒ 뉴스일보 무단 전재 및 재배포 금지"
+    assert stats["removed_boilerplate"] == ["홈", "공유하기"]
+
+
+def test_repeated_multi_line_paragraph_is_removed_whole():
+    long_line = "이 문장은 웹 페이지에서 두 번 복사되어 들어온 충분히 긴 본문 문장입니다."
+    raw = f"{long_line}\nSecond line.\n\n{long_line}\nSecond line."
+    cleaned, stats = preprocess_passage(raw)
+    assert cleaned == f"[1] {long_line} Second line."
+    assert stats["removed_duplicates"] == [f"{long_line} Second line."]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+콜드 스타트 회귀 점검.
+새 프로세스에서 AppTest로 첫 화면을 그리고, HAMCHANG_PROFILE_STARTUP 모드의 점검
+(openai 사전 로드 금지, HAMCHANG_STARTUP_BUDGET_MS 한도)이 통과하는지 확인한다.
+같은 프로세스를 python -X importtime 으로 실행해, 누적 import 시간 상위 모듈을 출력
+(junit 보고서에는 import_breakdown 속성으로 기록)하고 무거운 패키지가 없는지 본다.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = REPO_ROOT / "streamlit_app.py"
+
+# 스크립트 실행 구간만의 한도. 콜드 스타트 실측 약 100ms + 여유.
+# 느린 CI 러너에서는 HAMCHANG_STARTUP_BUDGET_MS 로 조정 가능
+DEFAULT_BUDGET_MS = "500"
+
+# 첫 화면에서 로드되면 안 되는 무거운 패키지 (API 호출 시에만 필요)
+LAZY_PACKAGES = {"openai", "httpx", "pydantic", "pydantic_core"}
+TOP_IMPORTS = 15
+
+RUN_APP = """
+import sys
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(sys.argv[1]).run(timeout=60)
+for exc in at.exception:
+    print(exc.message, file=sys.stderr)
+sys.exit(1 if at.exception else 0)
+"""
+
+
+def run_cold_start(tmp_path: Path) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["HAMCHANG_PROFILE_STARTUP"] = "1"
+    env.setdefault("HAMCHANG_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    # used_ids.txt 등 작업 폴더 파일을 건드리지 않도록 임시 폴더에서 실행
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_APP, str(APP_PATH)],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=180,
+    )
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, str]]:
+    """`-X importtime` 출력에서 (누적 시간 us, 모듈 이름) 목록을 뽑는다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def test_cold_start_within_budget_without_openai(tmp_path, record_property):
+    result = run_cold_start(tmp_path)
+    profile = "\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:"))
+    assert result.returncode == 0, result.stdout + profile
+
+    imports = parse_importtime(result.stderr)
+    top = sorted(imports, reverse=True)[:TOP_IMPORTS]
+    breakdown = "\n".join(f"{us / 1000:9.1f} ms  {name}" for us, name in top)
+    print(profile)
+    print(f"[import-time] top {TOP_IMPORTS} cumulative imports\n{breakdown}")
+    record_property("import_breakdown", breakdown)
+
+    loaded = {name for _, name in imports}
+    assert {"passage_preprocess", "prompts"} <= loaded
+    eager = sorted(name for name in loaded if name.split(".")[0] in LAZY_PACKAGES)
+    assert not eager, f"첫 화면에서 무거운 패키지가 로드됨: {eager}"
+    assert "[startup-profile] cold start" in result.stderr
+    assert "openai loaded: no" in result.stderr